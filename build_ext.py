@@ -0,0 +1,28 @@
+"""
+Ahead-of-time compile the bracket scan kernel with numba.pycc.
+
+Running this script produces a tax_kernels extension module next to
+tax_calculator.py. When present, calculate_tax_for_bracket uses it instead of
+JIT-compiling the kernel for bracket tables other than the built-in ones.
+calculate_tax and the CLI use the vectorized NumPy path and never call the
+kernel, so they neither need nor benefit from this build.
+
+Usage:
+    python build_ext.py
+"""
+
+import os
+
+from numba.pycc import CC
+
+from tax_calculator import _scan
+
+cc = CC('tax_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Same kernel as the JIT path
+cc.export('scan_brackets', 'UniTuple(f8, 2)(f8, f8[:], f8[:], f8[:], f8[:])')(_scan)
+
+
+if __name__ == "__main__":
+    cc.compile()
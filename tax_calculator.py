@@ -6,131 +6,452 @@ along with Social Security and Medicare taxes.
 """
 
 import argparse
-from typing import Dict, Tuple
+import functools
+import importlib.util
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
+)
 
 import numpy as np
-import pandas as pd
 
-pd.options.display.float_format = '{:.2%}'.format
+if TYPE_CHECKING:
+    import pandas as pd
+
+# numba is optional and slow to import, so only check for it here; kernels are
+# compiled on first use and the CLI path never imports it
+HAS_NUMBA = importlib.util.find_spec('numba') is not None
+
+try:
+    # Ahead-of-time compiled kernel produced by build_ext.py
+    from tax_kernels import scan_brackets
+    HAS_AOT_KERNELS = True
+except ImportError:
+    HAS_AOT_KERNELS = False
+
+# Upper bound of each top bracket; finite (rather than np.inf) so compiled and
+# vectorized kernels can use fastmath without infinity checks
+TOP_BRACKET_BOUND = 1e18
 
 # Tax rates and brackets are 2025 numbers
-# Format: {bracket_index: (rate, upper_bound)}
-TAX_BRACKETS: Dict[str, Dict[int, Tuple[float, float]]] = {
-    'FED': {
-        0: (0.10, 11925),
-        1: (0.12, 48475),
-        2: (0.22, 103350),
-        3: (0.24, 197300),
-        4: (0.32, 250525),
-        5: (0.35, 626350),
-        6: (0.37, np.inf),
-    },
-    'NY': {
-        0: (0.04, 8500),
-        1: (0.045, 11700),
-        2: (0.0525, 13900),
-        3: (0.055, 80650),
-        4: (0.06, 215400),
-        5: (0.0685, 1077550),
-        6: (0.0965, 5e6),
-        7: (0.103, 2.5e7),
-        8: (0.109, np.inf),  # Fixed: was 0.0109 (typo)
-    },
-    'NYC': {
-        0: (0.03078, 12000),
-        1: (0.03762, 25000),
-        2: (0.03819, 50000),
-        3: (0.03876, np.inf),
-    },
-    'Soc Sec': {
-        0: (0.062, 176100),
-        1: (0.0, np.inf),
-    },
-    'Med': {
-        0: (0.0145, np.inf),
-    },
-}
+# Format: ((rate, upper_bound), ...) ordered by ascending upper bound
+# Read-only, since derived tables below are precomputed from it at import
+TAX_BRACKETS: Mapping[str, Tuple[Tuple[float, float], ...]] = MappingProxyType({
+    'FED': (
+        (0.10, 11925),
+        (0.12, 48475),
+        (0.22, 103350),
+        (0.24, 197300),
+        (0.32, 250525),
+        (0.35, 626350),
+        (0.37, TOP_BRACKET_BOUND),
+    ),
+    'NY': (
+        (0.04, 8500),
+        (0.045, 11700),
+        (0.0525, 13900),
+        (0.055, 80650),
+        (0.06, 215400),
+        (0.0685, 1077550),
+        (0.0965, 5e6),
+        (0.103, 2.5e7),
+        (0.109, TOP_BRACKET_BOUND),  # Fixed: was 0.0109 (typo)
+    ),
+    'NYC': (
+        (0.03078, 12000),
+        (0.03762, 25000),
+        (0.03819, 50000),
+        (0.03876, TOP_BRACKET_BOUND),
+    ),
+    'Soc Sec': (
+        (0.062, 176100),
+        (0.0, TOP_BRACKET_BOUND),
+    ),
+    'Med': (
+        (0.0145, TOP_BRACKET_BOUND),
+    ),
+})
+
+
+class BracketArrays(NamedTuple):
+    """Array form of a single tax bracket table."""
+
+    rates: np.ndarray
+    uppers: np.ndarray
+    lowers: np.ndarray
+    cum_tax: np.ndarray  # Tax owed on all income below each bracket's lower bound
+    key: Optional[str] = None  # Built-in TAX_BRACKETS table these arrays came from
+
+
+SUMMARY_COLUMNS = ['Tax', 'Nominal Tax Rate', 'Marginal Tax Rate', 'Effective Tax Rate']
+
+
+def _bracket_arrays(
+    tax_bracket: Tuple[Tuple[float, float], ...],
+    key: Optional[str] = None
+) -> BracketArrays:
+    """Convert a bracket definition into contiguous arrays with cumulative tax."""
+    rates = np.array([rate for rate, _ in tax_bracket], dtype=np.float64)
+    uppers = np.array([upper for _, upper in tax_bracket], dtype=np.float64)
+    np.minimum(uppers, TOP_BRACKET_BOUND, out=uppers)
+    lowers = np.concatenate(([0.0], uppers[:-1]))
+    widths = uppers - lowers
+    # The open-ended top bracket never contributes a full width, so leave it out
+    cum_tax = np.concatenate(([0.0], np.cumsum(rates[:-1] * widths[:-1])))
+    return BracketArrays(rates, uppers, lowers, cum_tax, key)
+
+
+# Array form of TAX_BRACKETS, built once at import so lookups avoid dict hashing
+TAX_BRACKETS_ARR: Mapping[str, BracketArrays] = MappingProxyType({
+    key: _bracket_arrays(bracket, key) for key, bracket in TAX_BRACKETS.items()
+})
+
+
+# Packed tables use exact integer arithmetic: amounts in cents and rates in
+# millionths, so a bracket's tax is an integer count of 1e-8 dollars. Totals are
+# rounded to whole cents, which float64 holds exactly up to about $90 trillion
+RATE_SCALE = 1_000_000
+CENTS_PER_DOLLAR = 100
+# Largest amount in cents whose product with any rate <= 1 still fits in int64
+_MAX_CENTS = np.iinfo(np.int64).max // RATE_SCALE
+# Taxable incomes above this (about $92 billion) are rejected rather than clamped
+_MAX_TAXABLE_INCOME = _MAX_CENTS / CENTS_PER_DOLLAR
+
+
+def _to_cents(amounts: Union[float, np.ndarray]) -> np.ndarray:
+    """Round dollar amounts, which must not exceed _MAX_TAXABLE_INCOME, to int64 cents."""
+    return np.rint(np.asarray(amounts, dtype=np.float64) * CENTS_PER_DOLLAR).astype(np.int64)
+
+
+class PackedBrackets(NamedTuple):
+    """Bracket tables for several tax types padded into (max_brackets, n_types) arrays."""
+
+    keys: Tuple[str, ...]
+    rates: np.ndarray  # float rates, reported as marginal rates
+    rate_units: np.ndarray  # int64 rates in millionths
+    uppers: np.ndarray  # int64 cents
+    lowers: np.ndarray  # int64 cents
+    widths: np.ndarray  # int64 cents
+    columns: np.ndarray  # arange(n_types), for gathering one entry per column
+
+
+def _pack_brackets(bracket_arrays: Mapping[str, BracketArrays]) -> PackedBrackets:
+    """Stack per-type bracket arrays column-wise, padding with zero-width brackets."""
+    keys = tuple(bracket_arrays)
+    shape = (max(len(a.rates) for a in bracket_arrays.values()), len(keys))
+    rates = np.zeros(shape)
+    uppers = np.full(shape, TOP_BRACKET_BOUND)
+    lowers = np.full(shape, TOP_BRACKET_BOUND)
+
+    for j, arrays in enumerate(bracket_arrays.values()):
+        n = len(arrays.rates)
+        rates[:n, j] = arrays.rates
+        uppers[:n, j] = arrays.uppers
+        lowers[:n, j] = arrays.lowers
+
+    # Only the table bounds are clamped; the top-bracket sentinel would overflow int64
+    uppers_cents = _to_cents(np.minimum(uppers, _MAX_TAXABLE_INCOME))
+    lowers_cents = _to_cents(np.minimum(lowers, _MAX_TAXABLE_INCOME))
+    return PackedBrackets(
+        keys,
+        rates,
+        np.rint(rates * RATE_SCALE).astype(np.int64),
+        uppers_cents,
+        lowers_cents,
+        uppers_cents - lowers_cents,
+        np.arange(len(keys)),
+    )
+
+
+TAX_BRACKETS_PACKED = _pack_brackets(TAX_BRACKETS_ARR)
+
+
+def _packed_for(tax_brackets: Mapping[str, Tuple[Tuple[float, float], ...]]) -> PackedBrackets:
+    """Return packed arrays for tax_brackets, reusing the module tables when possible."""
+    if tax_brackets is TAX_BRACKETS:
+        return TAX_BRACKETS_PACKED
+    return _pack_brackets({key: _bracket_arrays(b) for key, b in tax_brackets.items()})
+
+
+def _bracket_indices(ti: np.ndarray, packed: PackedBrackets) -> np.ndarray:
+    """
+    Return the bracket reached by income for every tax type at once.
+
+    ti must already be in cents and shaped (..., 1, 1) to broadcast against the
+    packed tables.
+    Counting upper bounds strictly below income matches searchsorted(side='left')
+    per column, but shares one comparison across all tax types.
+    """
+    return (packed.uppers < ti).sum(axis=-2)
+
+
+def _category_taxes(
+    taxable_income: Union[float, np.ndarray],
+    packed: PackedBrackets
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return (taxes, marginal_rates) for every tax type in one vectorized pass.
+
+    taxable_income may be a scalar or an array of shape (M,); the outputs then
+    have shape (n_types,) or (M, n_types) respectively. Income is rounded to
+    whole cents, the tax is accumulated exactly in integers, and each total is
+    rounded to the nearest cent before conversion to float dollars.
+    """
+    ti = _to_cents(taxable_income)[..., np.newaxis, np.newaxis]
+    # Branchless: each bracket taxes the slice of income that falls inside it
+    slices = np.clip(ti - packed.lowers, 0, packed.widths)
+    tax_units = (packed.rate_units * slices).sum(axis=-2)
+    # Round half up to integer cents; tax_units is never negative
+    tax_cents = (tax_units + RATE_SCALE // 2) // RATE_SCALE
+    taxes = tax_cents / CENTS_PER_DOLLAR
+    marginal_rates = packed.rates[_bracket_indices(ti, packed), packed.columns]
+    return taxes, marginal_rates
+
+
+def _scan(
+    taxable_income: float,
+    rates: np.ndarray,
+    uppers: np.ndarray,
+    lowers: np.ndarray,
+    cum_tax: np.ndarray
+) -> Tuple[float, float]:
+    """
+    Bracket lookup kernel; returns (total_tax, marginal_rate) for positive income.
+
+    Compiled with numba by _compiled_scan, and exported ahead of time by
+    build_ext.py as tax_kernels.scan_brackets.
+    """
+    # Income above the top bound stays in the top bracket instead of indexing past it
+    i = min(np.searchsorted(uppers, taxable_income), len(uppers) - 1)
+    return cum_tax[i] + rates[i] * (taxable_income - lowers[i]), rates[i]
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_scan() -> Callable[..., Tuple[float, float]]:
+    """JIT-compile _scan on first use so numba is only imported when needed."""
+    from numba import njit
+
+    return njit(cache=True, fastmath=True)(_scan)
+
+
+def _build_scanner(key: str, arrays: BracketArrays) -> Callable[[float], Tuple[float, float]]:
+    """
+    Generate a scanner specialized to one bracket table.
+
+    The bracket constants are inlined into a straight-line chain of comparisons,
+    so the function has no array loads or loop. It runs as plain Python and is
+    only used when no compiled kernel is available, where it beats the NumPy
+    lookup. It returns the same (total_tax, marginal_rate) pair as _scan.
+    """
+    rates, uppers, lowers, cum_tax = (
+        [float(v) for v in a]
+        for a in (arrays.rates, arrays.uppers, arrays.lowers, arrays.cum_tax)
+    )
+    lines = [
+        "def scan(taxable_income):",
+        "    if taxable_income <= 0.0:",
+        f"        return 0.0, {rates[0]!r}",
+    ]
+    for rate, upper, lower, cum in zip(rates[:-1], uppers[:-1], lowers[:-1], cum_tax[:-1]):
+        lines += [
+            f"    if taxable_income <= {upper!r}:",
+            f"        return {cum!r} + {rate!r} * (taxable_income - {lower!r}), {rate!r}",
+        ]
+    rate, lower, cum = rates[-1], lowers[-1], cum_tax[-1]
+    lines.append(f"    return {cum!r} + {rate!r} * (taxable_income - {lower!r}), {rate!r}")
+
+    namespace: Dict[str, Callable[[float], Tuple[float, float]]] = {}
+    exec(compile("\n".join(lines), f"<scanner {key}>", "exec"), namespace)
+    return namespace["scan"]
+
+
+@functools.lru_cache(maxsize=None)
+def _specialized_scanner(key: str) -> Callable[[float], Tuple[float, float]]:
+    """Build the scanner for built-in table key on first use, then reuse it."""
+    return _build_scanner(key, TAX_BRACKETS_ARR[key])
 
 
 def calculate_tax_for_bracket(
     taxable_income: float,
-    tax_bracket: Dict[int, Tuple[float, float]]
+    tax_bracket: BracketArrays
 ) -> Tuple[float, float]:
     """
     Calculate tax amount for a given taxable income using specified tax brackets.
 
     Args:
         taxable_income: The income amount to calculate tax on.
-        tax_bracket: Dictionary mapping bracket index to (rate, upper_bound) tuples.
+        tax_bracket: Precomputed bracket arrays, as in TAX_BRACKETS_ARR.
+            Without a compiled kernel, tables with a key use a scanner
+            generated for that built-in table.
 
     Returns:
         A tuple of (total_tax, marginal_rate) where:
         - total_tax: The calculated tax amount
         - marginal_rate: The tax rate for the highest bracket reached
+
+    Raises:
+        ValueError: If taxable_income is NaN or infinite.
     """
+    if not np.isfinite(taxable_income):
+        raise ValueError("Taxable income must be finite")
     if taxable_income <= 0:
-        return 0.0, tax_bracket[0][0]
+        return 0.0, float(tax_bracket.rates[0])
+
+    if HAS_AOT_KERNELS or HAS_NUMBA:
+        kernel = scan_brackets if HAS_AOT_KERNELS else _compiled_scan()
+        tax, tax_rate = kernel(
+            float(taxable_income),
+            tax_bracket.rates,
+            tax_bracket.uppers,
+            tax_bracket.lowers,
+            tax_bracket.cum_tax,
+        )
+        return float(tax), float(tax_rate)
 
-    tax = 0.0
-    lower_bound = 0.0
-    i = 0
-    upper_bound = tax_bracket[0][1]
-    tax_rate = tax_bracket[0][0]
+    if tax_bracket.key is not None:
+        tax, tax_rate = _specialized_scanner(tax_bracket.key)(float(taxable_income))
+        return float(tax), float(tax_rate)
 
-    while taxable_income > upper_bound:
-        tax += tax_rate * (upper_bound - lower_bound)
-        i += 1
-        lower_bound = upper_bound
-        upper_bound = tax_bracket[i][1]
-        tax_rate = tax_bracket[i][0]
+    # Brackets are sorted by upper bound, so the first bound >= income is the one reached
+    i = min(np.searchsorted(tax_bracket.uppers, taxable_income), len(tax_bracket.uppers) - 1)
+    tax_rate = tax_bracket.rates[i]
+    tax = tax_bracket.cum_tax[i] + tax_rate * (taxable_income - tax_bracket.lowers[i])
+    return float(tax), float(tax_rate)
 
-    tax += tax_rate * (taxable_income - lower_bound)
-    return tax, tax_rate
+
+def _summarize(
+    incomes: np.ndarray,
+    deductions: np.ndarray,
+    packed: PackedBrackets
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Compute (labels, results) with results shaped (M, N+1, 4) for 1-D inputs.
+
+    Raises:
+        ValueError: If any taxable income is non-finite or above _MAX_TAXABLE_INCOME.
+    """
+    taxable = np.maximum(incomes - deductions, 0)
+    # The comparison is False for NaN as well as for values past the limit
+    if not np.all(taxable <= _MAX_TAXABLE_INCOME):
+        raise ValueError(
+            f"Taxable income must be finite and at most ${_MAX_TAXABLE_INCOME:,.0f}"
+        )
+    taxes, marginal_rates = _category_taxes(taxable, packed)
+
+    n = len(packed.keys)
+    results = np.empty((len(incomes), n + 1, len(SUMMARY_COLUMNS)))
+    # Avoid division by zero; reciprocals are shared by every tax type
+    inv_taxable = np.divide(1.0, taxable, out=np.zeros_like(taxable), where=taxable > 0)
+    inv_incomes = np.divide(1.0, incomes, out=np.zeros_like(incomes), where=incomes > 0)
+
+    results[:, :n, 0] = taxes
+    results[:, :n, 1] = taxes * inv_taxable[:, np.newaxis]
+    results[:, :n, 2] = marginal_rates
+    results[:, :n, 3] = taxes * inv_incomes[:, np.newaxis]
+    np.add.reduce(results[:, :n], axis=1, out=results[:, n])
+    return list(packed.keys) + ['ALL'], results
+
+
+@functools.lru_cache(maxsize=128)
+def _compute_tax_array(income: float, deduction: float) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """Cached summary for the module's TAX_BRACKETS; the returned array is read-only."""
+    labels, results = _summarize(
+        np.array([income], dtype=np.float64),
+        np.array([deduction], dtype=np.float64),
+        TAX_BRACKETS_PACKED,
+    )
+    results = results[0]
+    results.setflags(write=False)
+    return tuple(labels), results
 
 
 def calculate_tax(
     income: float,
     deduction: float,
-    tax_brackets: Dict[str, Dict[int, Tuple[float, float]]]
-) -> pd.DataFrame:
+    tax_brackets: Mapping[str, Tuple[Tuple[float, float], ...]],
+    return_dataframe: bool = True
+) -> Union['pd.DataFrame', Tuple[List[str], np.ndarray]]:
     """
     Calculate comprehensive tax summary across all tax types.
 
     Args:
         income: Gross income amount.
         deduction: Total deductions to subtract from income.
-        tax_brackets: Dictionary of tax bracket definitions by tax type.
+        tax_brackets: Mapping of tax bracket definitions by tax type.
+        return_dataframe: If False, skip DataFrame construction and return the
+            raw (labels, results) pair instead.
 
     Returns:
-        DataFrame with tax amounts and rates for each tax type.
+        DataFrame with tax amounts and rates for each tax type, or a tuple of
+        (row_labels, results) where results has one row per tax type plus ALL
+        and columns ordered as SUMMARY_COLUMNS.
 
     Raises:
-        ValueError: If income is negative or deduction exceeds income.
+        ValueError: If income or deduction is negative, or taxable income is
+            non-finite or above about $92 billion.
     """
     if income < 0:
         raise ValueError("Income cannot be negative")
     if deduction < 0:
         raise ValueError("Deduction cannot be negative")
 
-    taxable_income = max(income - deduction, 0)
-    summary = pd.DataFrame()
+    if tax_brackets is TAX_BRACKETS:
+        labels, results = _compute_tax_array(float(income), float(deduction))
+        # Copy so callers cannot mutate the cached array
+        labels, results = list(labels), results.copy()
+    else:
+        labels, results = _summarize(
+            np.array([income], dtype=np.float64),
+            np.array([deduction], dtype=np.float64),
+            _packed_for(tax_brackets),
+        )
+        results = results[0]
 
-    for key, bracket in tax_brackets.items():
-        tax, marginal_rate = calculate_tax_for_bracket(taxable_income, bracket)
+    if not return_dataframe:
+        return labels, results
 
-        # Avoid division by zero
-        nominal_rate = tax / taxable_income if taxable_income > 0 else 0.0
-        effective_rate = tax / income if income > 0 else 0.0
+    # pandas is only needed for DataFrame output, so import it lazily
+    import pandas as pd
 
-        summary[key] = pd.Series(
-            [tax, nominal_rate, marginal_rate, effective_rate],
-            index=['Tax', 'Nominal Tax Rate', 'Marginal Tax Rate', 'Effective Tax Rate']
-        )
+    # Wrap the finished array once; no per-column insertion into the frame
+    summary = pd.DataFrame(results, index=labels, columns=SUMMARY_COLUMNS, copy=False)
+    return summary.astype({'Tax': int})
 
-    summary['ALL'] = summary.sum(axis=1)
-    summary = summary.T
-    summary['Tax'] = summary['Tax'].astype(int)
-    return summary
+
+def calculate_tax_batch(
+    incomes: np.ndarray,
+    deductions: np.ndarray,
+    tax_brackets: Mapping[str, Tuple[Tuple[float, float], ...]]
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Calculate tax summaries for many (income, deduction) scenarios at once.
+
+    Args:
+        incomes: Array of gross income amounts, shape (M,); a scalar counts as M=1.
+        deductions: Array of deductions, broadcastable against incomes.
+        tax_brackets: Mapping of tax bracket definitions by tax type.
+
+    Returns:
+        A tuple of (row_labels, results) where results has shape (M, N+1, 4):
+        one summary per scenario laid out as in calculate_tax(return_dataframe=False).
+
+    Raises:
+        ValueError: If any income or deduction is negative, any taxable income
+            is non-finite or above about $92 billion, or the inputs do not
+            broadcast to a 1-D array.
+    """
+    incomes, deductions = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(incomes, dtype=np.float64)),
+        np.atleast_1d(np.asarray(deductions, dtype=np.float64)),
+    )
+    if incomes.ndim != 1:
+        raise ValueError("Incomes and deductions must broadcast to a 1-D array")
+    if np.any(incomes < 0):
+        raise ValueError("Income cannot be negative")
+    if np.any(deductions < 0):
+        raise ValueError("Deduction cannot be negative")
+
+    return _summarize(incomes, deductions, _packed_for(tax_brackets))
 
 
 def parse_args() -> argparse.Namespace:
@@ -174,6 +495,10 @@ Examples:
 
 def main() -> None:
     """Main entry point for the tax calculator."""
+    import pandas as pd
+
+    pd.options.display.float_format = '{:.2%}'.format
+
     args = parse_args()
 
     # Calculate income from either --income or --base + --bonus
@@ -199,7 +524,8 @@ def main() -> None:
 
     # Format tax column for display
     tax_summary_display = tax_summary.copy()
-    tax_summary_display['Tax'] = tax_summary_display['Tax'].apply(lambda x: '${:,}'.format(x))
+    taxes = tax_summary_display['Tax'].to_numpy()
+    tax_summary_display['Tax'] = ['${:,}'.format(int(v)) for v in taxes]
 
     # Calculate take-home rate (after 401k and taxes)
     take_home_rate = (income - contribution_401k - total_tax) / income
@@ -4,10 +4,15 @@ import pytest
 import numpy as np
 import pandas as pd
 
+import tax_calculator
 from tax_calculator import (
     calculate_tax_for_bracket,
     calculate_tax,
+    calculate_tax_batch,
+    BracketArrays,
     TAX_BRACKETS,
+    TAX_BRACKETS_ARR,
+    TOP_BRACKET_BOUND,
 )
 
 
@@ -16,19 +21,19 @@ class TestCalculateTaxForBracket:
 
     def test_zero_income(self):
         """Tax on zero income should be zero."""
-        tax, rate = calculate_tax_for_bracket(0, TAX_BRACKETS['FED'])
+        tax, rate = calculate_tax_for_bracket(0, TAX_BRACKETS_ARR['FED'])
         assert tax == 0.0
         assert rate == 0.10  # First bracket rate
 
     def test_negative_income(self):
         """Negative income should return zero tax."""
-        tax, rate = calculate_tax_for_bracket(-1000, TAX_BRACKETS['FED'])
+        tax, rate = calculate_tax_for_bracket(-1000, TAX_BRACKETS_ARR['FED'])
         assert tax == 0.0
 
     def test_first_bracket_only(self):
         """Income within first bracket."""
         # $10,000 income, all in 10% bracket
-        tax, rate = calculate_tax_for_bracket(10000, TAX_BRACKETS['FED'])
+        tax, rate = calculate_tax_for_bracket(10000, TAX_BRACKETS_ARR['FED'])
         assert tax == 1000.0  # 10% of $10,000
         assert rate == 0.10
 
@@ -38,7 +43,7 @@ class TestCalculateTaxForBracket:
         # First $11,925 at 10% = $1,192.50
         # Remaining $8,075 at 12% = $969.00
         # Total = $2,161.50
-        tax, rate = calculate_tax_for_bracket(20000, TAX_BRACKETS['FED'])
+        tax, rate = calculate_tax_for_bracket(20000, TAX_BRACKETS_ARR['FED'])
         expected = 11925 * 0.10 + (20000 - 11925) * 0.12
         assert abs(tax - expected) < 0.01
         assert rate == 0.12
@@ -46,19 +51,77 @@ class TestCalculateTaxForBracket:
     def test_high_income_multiple_brackets(self):
         """High income spanning multiple brackets."""
         # $200,000 income should go through several brackets
-        tax, rate = calculate_tax_for_bracket(200000, TAX_BRACKETS['FED'])
+        tax, rate = calculate_tax_for_bracket(200000, TAX_BRACKETS_ARR['FED'])
         assert tax > 0
         assert rate == 0.32  # Should be in 32% bracket ($197,300 - $250,525)
 
     def test_social_security_cap(self):
         """Social Security tax should cap at wage base."""
         # Income above SS wage base ($176,100)
-        tax_below, _ = calculate_tax_for_bracket(176100, TAX_BRACKETS['Soc Sec'])
-        tax_above, _ = calculate_tax_for_bracket(200000, TAX_BRACKETS['Soc Sec'])
+        tax_below, _ = calculate_tax_for_bracket(176100, TAX_BRACKETS_ARR['Soc Sec'])
+        tax_above, _ = calculate_tax_for_bracket(200000, TAX_BRACKETS_ARR['Soc Sec'])
         # Both should be the same (capped)
         assert abs(tax_below - tax_above) < 0.01
         assert abs(tax_below - 176100 * 0.062) < 0.01
 
+    @pytest.mark.parametrize('use_numba, key', [(True, None), (False, None), (False, 'FED')])
+    def test_income_above_top_bound(self, use_numba, key, monkeypatch):
+        """Income past the finite top bound stays in the top bracket on every path."""
+        if use_numba and not tax_calculator.HAS_NUMBA:
+            pytest.skip("numba not installed")
+        monkeypatch.setattr(tax_calculator, 'HAS_AOT_KERNELS', False)
+        monkeypatch.setattr(tax_calculator, 'HAS_NUMBA', use_numba)
+        arrays = TAX_BRACKETS_ARR['FED']._replace(key=key)
+        tax, rate = calculate_tax_for_bracket(2e18, arrays)
+        assert rate == 0.37
+        assert tax == pytest.approx(arrays.cum_tax[-1] + 0.37 * (2e18 - arrays.lowers[-1]))
+
+    @pytest.mark.parametrize('use_numba', [True, False])
+    @pytest.mark.parametrize('income', [np.inf, np.nan])
+    def test_non_finite_income_raises(self, income, use_numba, monkeypatch):
+        """NaN or infinite income is rejected before any kernel runs."""
+        monkeypatch.setattr(tax_calculator, 'HAS_NUMBA', use_numba)
+        for arrays in (TAX_BRACKETS_ARR['FED'], TAX_BRACKETS_ARR['FED']._replace(key=None)):
+            with pytest.raises(ValueError, match="Taxable income must be finite"):
+                calculate_tax_for_bracket(income, arrays)
+
+    @pytest.mark.parametrize('income', [5000, 11925, 20000, 200000, 3e7])
+    def test_numpy_fallback_matches_compiled_scan(self, income, monkeypatch):
+        """NumPy fallback and compiled scan should agree."""
+        # Without a key the table takes the NumPy path once numba is disabled
+        arrays = TAX_BRACKETS_ARR['NY']._replace(key=None)
+        compiled = calculate_tax_for_bracket(income, arrays)
+        monkeypatch.setattr(tax_calculator, 'HAS_AOT_KERNELS', False)
+        monkeypatch.setattr(tax_calculator, 'HAS_NUMBA', False)
+        fallback = calculate_tax_for_bracket(income, arrays)
+        assert abs(compiled[0] - fallback[0]) < 0.01
+        assert compiled[1] == fallback[1]
+
+
+class TestSpecializedScanners:
+    """Tests for the scanners generated for the built-in bracket tables."""
+
+    @pytest.mark.parametrize('income', [-1000, 0, 100, 11925, 20000, 176100, 2e6, 3e7])
+    def test_matches_generic_lookup(self, income, monkeypatch):
+        """Generated scanners should agree with the NumPy lookup on the same table."""
+        # Scanners are only used when no compiled kernel is available
+        monkeypatch.setattr(tax_calculator, 'HAS_AOT_KERNELS', False)
+        monkeypatch.setattr(tax_calculator, 'HAS_NUMBA', False)
+        for arrays in TAX_BRACKETS_ARR.values():
+            tax, rate = calculate_tax_for_bracket(income, arrays)
+            generic = arrays._replace(key=None)
+            expected_tax, expected_rate = calculate_tax_for_bracket(income, generic)
+            assert abs(tax - expected_tax) < 0.01
+            assert rate == expected_rate
+
+    def test_equal_copy_takes_same_path(self):
+        """Dispatch follows the table's key, so an equal copy behaves the same."""
+        arrays = TAX_BRACKETS_ARR['FED']
+        assert BracketArrays(*arrays).key == 'FED'
+        assert calculate_tax_for_bracket(60000, BracketArrays(*arrays)) == (
+            calculate_tax_for_bracket(60000, arrays)
+        )
+
 
 class TestCalculateTax:
     """Tests for calculate_tax function."""
@@ -112,6 +175,94 @@ class TestCalculateTax:
         result_high_deduction = calculate_tax(60000, 20000, TAX_BRACKETS)
         assert result_high_deduction.loc['ALL', 'Tax'] < result_low_deduction.loc['ALL', 'Tax']
 
+    @pytest.mark.parametrize('income', [100, 25000, 180000, 2e6, 3e7])
+    def test_matches_per_bracket_calculation(self, income):
+        """Vectorized summary should agree with the per-bracket calculation."""
+        result = calculate_tax(income, 0, TAX_BRACKETS)
+        for tax_type, arrays in TAX_BRACKETS_ARR.items():
+            tax, rate = calculate_tax_for_bracket(income, arrays)
+            assert result.loc[tax_type, 'Tax'] == int(tax)
+            assert result.loc[tax_type, 'Marginal Tax Rate'] == rate
+
+    def test_array_output(self):
+        """return_dataframe=False returns labels and the raw results array."""
+        labels, results = calculate_tax(60000, 15000, TAX_BRACKETS, return_dataframe=False)
+        expected = calculate_tax(60000, 15000, TAX_BRACKETS)
+        assert labels == list(expected.index)
+        assert results.shape == (6, 4)
+        assert list(results[:, 0].astype(int)) == list(expected['Tax'])
+        assert np.allclose(results[:, 1:], expected.iloc[:, 1:].to_numpy())
+
+    def test_repeated_calls_are_independent(self):
+        """Mutating one result must not leak into later (cached) calls."""
+        _, first = calculate_tax(60000, 15000, TAX_BRACKETS, return_dataframe=False)
+        first[:] = 0
+        _, second = calculate_tax(60000, 15000, TAX_BRACKETS, return_dataframe=False)
+        assert second[-1, 0] > 0
+
+    def test_custom_brackets(self):
+        """Brackets of differing lengths are supported."""
+        brackets = {
+            'A': ((0.10, 1000), (0.20, np.inf)),
+            'B': ((0.05, np.inf),),
+        }
+        result = calculate_tax(3000, 0, brackets)
+        assert result.loc['A', 'Tax'] == 500
+        assert result.loc['B', 'Tax'] == 150
+        assert result.loc['ALL', 'Tax'] == 650
+
+    def test_tax_is_exact_to_the_cent(self):
+        """Bracket tax is accumulated in integers, so cent amounts stay exact."""
+        brackets = {'A': ((0.10, 1000.10), (0.20, np.inf))}
+        _, results = calculate_tax(1000.30, 0, brackets, return_dataframe=False)
+        assert results[0, 0] == 100.05
+
+    def test_infinite_upper_bound_is_clipped(self):
+        """np.inf upper bounds are treated as TOP_BRACKET_BOUND."""
+        brackets = {'A': ((0.10, 1000), (0.20, np.inf))}
+        result = calculate_tax(1e9, 0, brackets)
+        assert result.loc['A', 'Tax'] == int(100 + 0.20 * (1e9 - 1000))
+
+
+class TestCalculateTaxBatch:
+    """Tests for calculate_tax_batch function."""
+
+    def test_matches_scalar_calculation(self):
+        """Each batch row should equal the scalar summary for that scenario."""
+        incomes = np.array([0, 100, 50000, 60000, 250000, 10_000_000])
+        deductions = np.array([0, 0, 60000, 15000, 15000, 100_000])
+        labels, results = calculate_tax_batch(incomes, deductions, TAX_BRACKETS)
+        assert results.shape == (6, 6, 4)
+        for k, (income, deduction) in enumerate(zip(incomes, deductions)):
+            expected_labels, expected = calculate_tax(
+                income, deduction, TAX_BRACKETS, return_dataframe=False
+            )
+            assert labels == expected_labels
+            assert np.allclose(results[k], expected)
+
+    def test_scalar_deduction_broadcasts(self):
+        """A single deduction applies to every income."""
+        _, results = calculate_tax_batch(np.array([40000, 80000]), 15000, TAX_BRACKETS)
+        _, expected = calculate_tax(80000, 15000, TAX_BRACKETS, return_dataframe=False)
+        assert np.allclose(results[1], expected)
+
+    def test_scalar_inputs(self):
+        """Scalar income and deduction are treated as a single scenario."""
+        _, results = calculate_tax_batch(60000, 15000, TAX_BRACKETS)
+        _, expected = calculate_tax(60000, 15000, TAX_BRACKETS, return_dataframe=False)
+        assert results.shape == (1, 6, 4)
+        assert np.allclose(results[0], expected)
+
+    def test_multidimensional_input_raises(self):
+        """Inputs must broadcast to a 1-D array."""
+        with pytest.raises(ValueError, match="1-D"):
+            calculate_tax_batch(np.ones((2, 2)) * 50000, 0, TAX_BRACKETS)
+
+    def test_negative_income_raises(self):
+        """Negative income should raise ValueError."""
+        with pytest.raises(ValueError, match="Income cannot be negative"):
+            calculate_tax_batch(np.array([1000, -1]), 0, TAX_BRACKETS)
+
 
 class TestTaxBrackets:
     """Tests for tax bracket data integrity."""
@@ -128,11 +279,38 @@ class TestTaxBrackets:
         for i in range(1, len(rates)):
             assert rates[i] > rates[i-1], f"NY rate {rates[i]} should be > {rates[i-1]}"
 
-    def test_brackets_have_inf_upper_bound(self):
-        """Last bracket should have infinite upper bound."""
+    def test_brackets_end_with_top_bound(self):
+        """Last bracket should extend to the finite top-bracket sentinel."""
+        for tax_type, brackets in TAX_BRACKETS.items():
+            assert brackets[-1][1] == TOP_BRACKET_BOUND, (
+                f"{tax_type} should end with TOP_BRACKET_BOUND"
+            )
+
+    def test_brackets_are_read_only(self):
+        """Built-in tables cannot be changed behind the precomputed arrays' back."""
+        with pytest.raises(TypeError):
+            TAX_BRACKETS['Med'] = ((0.5, TOP_BRACKET_BOUND),)
+        with pytest.raises(TypeError):
+            TAX_BRACKETS_ARR['Med'] = TAX_BRACKETS_ARR['FED']
+
+    def test_modified_copy_is_honored(self):
+        """A modified copy of the built-in tables is computed from scratch."""
+        brackets = dict(TAX_BRACKETS, Med=((0.5, TOP_BRACKET_BOUND),))
+        assert calculate_tax(60000, 0, brackets).loc['Med', 'Tax'] == 30000
+
+    def test_bracket_arrays_match_brackets(self):
+        """Precomputed arrays should mirror the bracket definitions."""
         for tax_type, brackets in TAX_BRACKETS.items():
-            last_bracket = max(brackets.keys())
-            assert brackets[last_bracket][1] == np.inf, f"{tax_type} should end with inf"
+            arrays = TAX_BRACKETS_ARR[tax_type]
+            assert list(arrays.rates) == [rate for rate, _ in brackets]
+            assert list(arrays.uppers) == [upper for _, upper in brackets]
+
+    def test_cumulative_tax_at_bracket_boundaries(self):
+        """Cumulative tax should equal the tax owed at each lower bound."""
+        arrays = TAX_BRACKETS_ARR['FED']
+        for lower, cum_tax in zip(arrays.lowers[1:], arrays.cum_tax[1:]):
+            tax, _ = calculate_tax_for_bracket(lower, arrays)
+            assert abs(tax - cum_tax) < 0.01
 
 
 class TestEdgeCases:
@@ -143,6 +321,34 @@ class TestEdgeCases:
         result = calculate_tax(10_000_000, 100_000, TAX_BRACKETS)
         assert result.loc['ALL', 'Tax'] > 0
 
+    def test_income_above_integer_limit_raises(self):
+        """Taxable income beyond the exact-integer range is rejected, not clamped."""
+        with pytest.raises(ValueError, match="Taxable income must be finite"):
+            calculate_tax(1e11, 0, TAX_BRACKETS)
+        # Deductions bring taxable income back into range
+        assert calculate_tax(1e11, 1e11 - 1e6, TAX_BRACKETS).loc['FED', 'Tax'] > 0
+
+    def test_largest_supported_income(self):
+        """Tax just below the limit matches the float bracket calculation."""
+        income = 9e10
+        result = calculate_tax(income, 0, TAX_BRACKETS)
+        expected, _ = calculate_tax_for_bracket(income, TAX_BRACKETS_ARR['FED'])
+        assert abs(result.loc['FED', 'Tax'] - expected) < 1
+
+    def test_large_income_tax_is_whole_cents(self):
+        """Totals are rounded to cents, which stay exact in float at any supported income."""
+        _, results = calculate_tax(9e10 + 0.37, 0, TAX_BRACKETS, return_dataframe=False)
+        cents = results[:, 0] * 100
+        assert np.allclose(cents, np.round(cents), rtol=0, atol=1e-3)
+
+    def test_non_finite_income_raises(self):
+        """NaN or infinite income raises instead of producing a bogus tax."""
+        for income in (np.nan, np.inf):
+            with pytest.raises(ValueError, match="Taxable income must be finite"):
+                calculate_tax(income, 0, TAX_BRACKETS)
+        with pytest.raises(ValueError, match="Taxable income must be finite"):
+            calculate_tax_batch(np.array([50000, np.nan]), 0, TAX_BRACKETS)
+
     def test_income_equals_deduction(self):
         """Income exactly equals deduction (zero taxable income)."""
         result = calculate_tax(50000, 50000, TAX_BRACKETS)